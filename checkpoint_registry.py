@@ -0,0 +1,353 @@
+import os
+import json
+import time
+import shutil
+import sqlite3
+import hashlib
+import argparse
+
+CHECKPOINT_ROOT = 'checkpoints'
+DEFAULT_REGISTRY_PATH = os.path.join(CHECKPOINT_ROOT, 'registry.db')
+
+# gc tidak menyentuh direktori bobot yang lebih muda dari ini: trainer menyimpan
+# bobot sebelum register(), jadi direktori baru bisa belum tercatat
+DEFAULT_GC_MIN_AGE = 3600
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS checkpoints (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_id TEXT NOT NULL,
+    episode INTEGER NOT NULL,
+    path TEXT NOT NULL UNIQUE,
+    score REAL,
+    hyperparams TEXT NOT NULL DEFAULT '{}',
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_checkpoints_score ON checkpoints (score);
+CREATE INDEX IF NOT EXISTS idx_checkpoints_run ON checkpoints (run_id, episode);
+CREATE INDEX IF NOT EXISTS idx_checkpoints_run_score ON checkpoints (run_id, score);
+CREATE INDEX IF NOT EXISTS idx_checkpoints_created ON checkpoints (created_at, id);
+
+CREATE TABLE IF NOT EXISTS files (
+    checkpoint_id INTEGER NOT NULL REFERENCES checkpoints (id) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    sha256 TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    PRIMARY KEY (checkpoint_id, name)
+);
+
+-- Pointer best/latest per run, diperbarui saat register sehingga query O(1)
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    best_id INTEGER REFERENCES checkpoints (id) ON DELETE SET NULL,
+    latest_id INTEGER REFERENCES checkpoints (id) ON DELETE SET NULL
+);
+
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+def file_digest(path, chunk_size=1 << 20):
+    sha = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+def is_weights_dir(path):
+    """Direktori berisi bobot hasil LunarLanderAgent.save"""
+    return os.path.exists(os.path.join(path, 'actor.index'))
+
+
+def last_modified(path):
+    """Waktu modifikasi terbaru dari direktori dan file di dalamnya"""
+    mtimes = [os.path.getmtime(path)]
+    for name in os.listdir(path):
+        mtimes.append(os.path.getmtime(os.path.join(path, name)))
+    return max(mtimes)
+
+
+class CheckpointRegistry:
+    """Index SQLite untuk checkpoint: run, episode, skor, hyperparameter dan digest file.
+
+    Menyimpan pointer best/latest per run sehingga resume, evaluasi dan
+    deployment tidak perlu menelusuri direktori checkpoints/.
+    """
+    def __init__(self, path=DEFAULT_REGISTRY_PATH, checkpoint_root=CHECKPOINT_ROOT):
+        self.path = path
+        # Path checkpoint, import dan gc relatif terhadap root checkpoint,
+        # bukan terhadap lokasi file database
+        self.root = os.path.abspath(checkpoint_root)
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        # timeout besar karena beberapa proses (mis. pbt.py) bisa menulis bersamaan
+        self.conn = sqlite3.connect(path, timeout=30.0)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute('PRAGMA foreign_keys = ON')
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def _relpath(self, path):
+        # Path di bawah root checkpoint disimpan relatif agar tetap valid jika repo
+        # dipindah; path di luar root disimpan absolut
+        path = os.path.abspath(path)
+        relpath = os.path.relpath(path, self.root)
+        return path if relpath.startswith(os.pardir) else relpath
+
+    def _abspath(self, relpath):
+        return os.path.join(self.root, relpath)
+
+    def _to_dict(self, row):
+        if row is None:
+            return None
+        record = dict(row)
+        record['path'] = self._abspath(record['path'])
+        record['hyperparams'] = json.loads(record['hyperparams'])
+        return record
+
+    def register(self, path, run_id, episode, score=None, hyperparams=None):
+        """Catat checkpoint yang baru saja disimpan beserta digest file-nya"""
+        files = []
+        for name in sorted(os.listdir(path)):
+            file_path = os.path.join(path, name)
+            if os.path.isfile(file_path):
+                files.append((name, file_digest(file_path), os.path.getsize(file_path)))
+
+        with self.conn:
+            previous = self.conn.execute(
+                'SELECT run_id FROM checkpoints WHERE path = ?', (self._relpath(path),)
+            ).fetchone()
+            cursor = self.conn.execute(
+                """INSERT INTO checkpoints (run_id, episode, path, score, hyperparams, created_at)
+                   VALUES (?, ?, ?, ?, ?, ?)
+                   ON CONFLICT (path) DO UPDATE SET
+                       run_id = excluded.run_id, episode = excluded.episode, score = excluded.score,
+                       hyperparams = excluded.hyperparams, created_at = excluded.created_at
+                   RETURNING id""",
+                (run_id, episode, self._relpath(path), score,
+                 json.dumps(hyperparams or {}, sort_keys=True), time.time())
+            )
+            checkpoint_id = cursor.fetchone()[0]
+            self.conn.execute('DELETE FROM files WHERE checkpoint_id = ?', (checkpoint_id,))
+            self.conn.executemany(
+                'INSERT INTO files (checkpoint_id, name, sha256, size) VALUES (?, ?, ?, ?)',
+                [(checkpoint_id, name, digest, size) for name, digest, size in files]
+            )
+            self._update_run(run_id, checkpoint_id, episode, score)
+            # Path yang didaftarkan ulang ke run lain meninggalkan pointer run lama
+            if previous is not None and previous['run_id'] != run_id:
+                self._refresh_run(previous['run_id'])
+        return checkpoint_id
+
+    def _update_run(self, run_id, checkpoint_id, episode, score):
+        self.conn.execute('INSERT OR IGNORE INTO runs (run_id) VALUES (?)', (run_id,))
+        run = self.conn.execute(
+            """SELECT runs.best_id, runs.latest_id,
+                      latest.episode AS latest_episode, best.score AS best_score
+               FROM runs
+               LEFT JOIN checkpoints AS latest ON latest.id = runs.latest_id
+               LEFT JOIN checkpoints AS best ON best.id = runs.best_id
+               WHERE runs.run_id = ?""",
+            (run_id,)
+        ).fetchone()
+        # Checkpoint yang sedang jadi pointer diubah (mis. skor best diturunkan):
+        # pointer bisa basi, jadi hitung ulang dari tabel checkpoints
+        if checkpoint_id in (run['best_id'], run['latest_id']):
+            self._refresh_run(run_id)
+            return
+        if run['latest_episode'] is None or episode >= run['latest_episode']:
+            self.conn.execute('UPDATE runs SET latest_id = ? WHERE run_id = ?', (checkpoint_id, run_id))
+        if score is not None and (run['best_score'] is None or score >= run['best_score']):
+            self.conn.execute('UPDATE runs SET best_id = ? WHERE run_id = ?', (checkpoint_id, run_id))
+
+    def update_score(self, path, score):
+        """Perbarui skor checkpoint, mis. setelah evaluasi terpisah"""
+        with self.conn:
+            row = self.conn.execute(
+                'UPDATE checkpoints SET score = ? WHERE path = ? RETURNING id, run_id, episode',
+                (score, self._relpath(path))
+            ).fetchone()
+            if row is None:
+                raise KeyError(f"Checkpoint {path} is not registered")
+            self._update_run(row['run_id'], row['id'], row['episode'], score)
+
+    def get(self, path):
+        return self._to_dict(self.conn.execute(
+            'SELECT * FROM checkpoints WHERE path = ?', (self._relpath(path),)
+        ).fetchone())
+
+    def best(self, run_id=None):
+        """Checkpoint dengan skor tertinggi, untuk satu run atau seluruh registry"""
+        if run_id is not None:
+            row = self.conn.execute(
+                'SELECT c.* FROM runs JOIN checkpoints AS c ON c.id = runs.best_id WHERE runs.run_id = ?',
+                (run_id,)
+            ).fetchone()
+        else:
+            row = self.conn.execute(
+                'SELECT * FROM checkpoints WHERE score IS NOT NULL ORDER BY score DESC LIMIT 1'
+            ).fetchone()
+        return self._to_dict(row)
+
+    def latest(self, run_id=None):
+        """Checkpoint episode terakhir untuk satu run, atau yang terakhir disimpan"""
+        if run_id is not None:
+            row = self.conn.execute(
+                'SELECT c.* FROM runs JOIN checkpoints AS c ON c.id = runs.latest_id WHERE runs.run_id = ?',
+                (run_id,)
+            ).fetchone()
+        else:
+            row = self.conn.execute(
+                'SELECT * FROM checkpoints ORDER BY created_at DESC, id DESC LIMIT 1'
+            ).fetchone()
+        return self._to_dict(row)
+
+    def runs(self):
+        return [row['run_id'] for row in self.conn.execute('SELECT run_id FROM runs ORDER BY run_id')]
+
+    def verify(self, path):
+        """Bandingkan digest file di disk dengan yang tercatat; kembalikan nama file yang berbeda"""
+        record = self.get(path)
+        if record is None:
+            raise KeyError(f"Checkpoint {path} is not registered")
+        mismatched = []
+        for row in self.conn.execute('SELECT name, sha256 FROM files WHERE checkpoint_id = ?', (record['id'],)):
+            file_path = os.path.join(path, row['name'])
+            if not os.path.exists(file_path) or file_digest(file_path) != row['sha256']:
+                mismatched.append(row['name'])
+        return mismatched
+
+    def unregister(self, path):
+        with self.conn:
+            row = self.conn.execute(
+                'DELETE FROM checkpoints WHERE path = ? RETURNING run_id', (self._relpath(path),)
+            ).fetchone()
+            if row is not None:
+                self._refresh_run(row['run_id'])
+
+    def _refresh_run(self, run_id):
+        # Hitung ulang pointer best/latest setelah checkpoint dihapus dari run
+        latest = self.conn.execute(
+            'SELECT id FROM checkpoints WHERE run_id = ? ORDER BY episode DESC LIMIT 1', (run_id,)
+        ).fetchone()
+        if latest is None:
+            self.conn.execute('DELETE FROM runs WHERE run_id = ?', (run_id,))
+            return
+        best = self.conn.execute(
+            """SELECT id FROM checkpoints WHERE run_id = ? AND score IS NOT NULL
+               ORDER BY score DESC, episode DESC LIMIT 1""", (run_id,)
+        ).fetchone()
+        self.conn.execute(
+            'UPDATE runs SET latest_id = ?, best_id = ? WHERE run_id = ?',
+            (latest['id'], best['id'] if best else None, run_id)
+        )
+
+    def import_existing(self):
+        """Daftarkan checkpoint lama (tanpa skor) hasil scan satu kali checkpoints/<run>/ep_*"""
+        imported = 0
+        for dirpath, dirnames, _ in os.walk(self.root):
+            dirnames.sort()
+            if not is_weights_dir(dirpath) or self.get(dirpath) is not None:
+                continue
+            run_dir, name = os.path.split(os.path.relpath(dirpath, self.root))
+            if not name.startswith('ep_') or not name[len('ep_'):].isdigit():
+                continue
+            self.register(dirpath, run_dir, int(name[len('ep_'):]))
+            imported += 1
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('imported_at', ?)", (str(time.time()),)
+            )
+        return imported
+
+    def has_imported(self):
+        return self.conn.execute("SELECT 1 FROM meta WHERE key = 'imported_at'").fetchone() is not None
+
+    def gc(self, dry_run=True, min_age=DEFAULT_GC_MIN_AGE):
+        """Hapus direktori bobot di bawah root checkpoint yang tidak tercatat di registry.
+
+        Direktori yang diubah dalam min_age detik terakhir dilewati karena bisa
+        jadi checkpoint yang baru disimpan dan belum di-register.
+        """
+        if not dry_run and not self.has_imported():
+            raise RuntimeError("Registry has never imported existing checkpoints, run 'import' before gc")
+        referenced = {row['path'] for row in self.conn.execute('SELECT path FROM checkpoints')}
+        cutoff = time.time() - min_age
+        removed = []
+        for dirpath, dirnames, _ in os.walk(self.root):
+            if not is_weights_dir(dirpath):
+                continue
+            dirnames.clear()
+            if self._relpath(dirpath) in referenced or last_modified(dirpath) > cutoff:
+                continue
+            removed.append(dirpath)
+            if not dry_run:
+                shutil.rmtree(dirpath)
+        return removed
+
+
+def resolve_checkpoint(registry_path=DEFAULT_REGISTRY_PATH, run_id=None, which='latest',
+                       checkpoint_root=CHECKPOINT_ROOT):
+    """Path checkpoint best/latest dari registry, atau None jika belum ada"""
+    if not os.path.exists(registry_path):
+        return None
+    registry = CheckpointRegistry(registry_path, checkpoint_root)
+    try:
+        record = registry.best(run_id) if which == 'best' else registry.latest(run_id)
+    finally:
+        registry.close()
+    return record['path'] if record else None
+
+
+def main(args):
+    registry = CheckpointRegistry(args.registry, args.checkpoint_root)
+    try:
+        if args.command == 'import':
+            print(f"Imported {registry.import_existing()} checkpoints")
+        elif args.command in ('best', 'latest'):
+            record = getattr(registry, args.command)(args.run_id)
+            print(json.dumps(record, indent=2) if record else 'No checkpoint found')
+        elif args.command == 'runs':
+            for run_id in registry.runs():
+                print(run_id)
+        elif args.command == 'verify':
+            mismatched = registry.verify(args.path)
+            print('OK' if not mismatched else f"Digest mismatch: {', '.join(mismatched)}")
+        elif args.command == 'gc':
+            removed = registry.gc(dry_run=not args.delete, min_age=args.min_age)
+            action = 'Removed' if args.delete else 'Would remove'
+            for path in removed:
+                print(f"{action} {path}")
+    finally:
+        registry.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Checkpoint registry')
+    parser.add_argument('--registry', type=str, default=DEFAULT_REGISTRY_PATH)
+    parser.add_argument('--checkpoint-root', type=str, default=CHECKPOINT_ROOT,
+                        help='Directory containing <run>/ep_* checkpoints')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    subparsers.add_parser('import', help='Index existing checkpoint directories once')
+    for command in ('best', 'latest'):
+        subparser = subparsers.add_parser(command, help=f'Show the {command} checkpoint')
+        subparser.add_argument('--run-id', type=str, default=None)
+    subparsers.add_parser('runs', help='List registered runs')
+    verify_parser = subparsers.add_parser('verify', help='Check file digests of a checkpoint')
+    verify_parser.add_argument('path', type=str)
+    gc_parser = subparsers.add_parser('gc', help='Remove weight directories not in the registry')
+    gc_parser.add_argument('--delete', action='store_true',
+                           help='Actually delete (default: dry run); requires a prior import')
+    gc_parser.add_argument('--min-age', type=float, default=DEFAULT_GC_MIN_AGE,
+                           help='Skip weight directories modified in the last N seconds')
+    args = parser.parse_args()
+
+    try:
+        main(args)
+    except RuntimeError as e:
+        parser.error(str(e))
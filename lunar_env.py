@@ -1,5 +1,4 @@
 import numpy as np
-import pygame
 import gymnasium as gym
 from gymnasium import spaces
 import random
@@ -7,9 +6,13 @@ import math
 import time
 
 class LunarEnvironment(gym.Env):
-    def __init__(self):
+    def __init__(self, max_episode_steps=1000):
         super(LunarEnvironment, self).__init__()
         
+        # Batas jumlah step per episode (None = tanpa batas)
+        self.max_episode_steps = max_episode_steps
+        self.steps = 0
+        
         # Definisi space untuk aksi dan observasi
         # Aksi: [thrust_top_left, thrust_top_right, thrust_bottom_left, thrust_bottom_right]
         self.action_space = spaces.Box(
@@ -26,12 +29,11 @@ class LunarEnvironment(gym.Env):
             dtype=np.float32
         )
         
-        # Inisialisasi pygame dengan flag yang benar
-        pygame.init()
+        # Window pygame baru dibuat saat render() pertama dipanggil,
+        # sehingga run headless tidak perlu memuat pygame sama sekali
         self.screen_width = 800
         self.screen_height = 600
-        self.screen = pygame.display.set_mode((self.screen_width, self.screen_height), pygame.HWSURFACE | pygame.DOUBLEBUF)
-        pygame.display.set_caption("Lunar Probe")
+        self.screen = None
         
         # Ukuran probe dan thruster
         self.probe_size = 30
@@ -216,6 +218,7 @@ class LunarEnvironment(gym.Env):
         
         self.thrust_particles = []
         self.last_action = np.zeros(4)
+        self.steps = 0
         return self._get_observation()
     
     def step(self, action):
@@ -258,13 +261,20 @@ class LunarEnvironment(gym.Env):
             
             self.asteroids[i] = asteroid
         
+        self.steps += 1
+        
         # Hitung reward
         reward = self._calculate_reward()
         
-        # Cek apakah episode selesai
-        done = self._is_done()
+        # Cek apakah episode selesai (terminal sungguhan)
+        terminated = self._is_done()
+        
+        # Episode dipotong karena batas waktu, bukan karena state terminal
+        truncated = (not terminated and
+                     self.max_episode_steps is not None and
+                     self.steps >= self.max_episode_steps)
         
-        return self._get_observation(), reward, done, {}
+        return self._get_observation(), reward, terminated, truncated, {}
     
     def _get_observation(self):
         return np.array([
@@ -291,9 +301,13 @@ class LunarEnvironment(gym.Env):
         )
         reward -= 0.01 * distance_to_target
         
-        # Bonus untuk mencapai target
+        # Bonus untuk mencapai target; urutan sama dengan _is_done sehingga
+        # landing di zona target tidak dihitung sebagai tabrakan
         if self._is_at_target():
             reward += 100.0
+        # Penalti untuk menabrak permukaan
+        elif self._is_crashed():
+            reward -= 100.0
         
         return reward
     
@@ -314,14 +328,15 @@ class LunarEnvironment(gym.Env):
             return True
         
         # Cek tabrakan dengan permukaan bulan
-        if self.state['y'] >= self.moon_surface_y - self.probe_size/2:
-            done = True
-            reward = -100  # Penalti untuk menabrak permukaan
+        if self._is_crashed():
             self.state['y'] = self.moon_surface_y - self.probe_size/2  # Prevent going below surface
-            return self._get_observation(), reward, done, {}
+            return True
         
         return False
     
+    def _is_crashed(self):
+        return self.state['y'] >= self.moon_surface_y - self.probe_size/2
+    
     def _is_at_target(self):
         distance_to_target = np.sqrt(
             (self.state['x'] - self.state['target_x'])**2 +
@@ -348,9 +363,14 @@ class LunarEnvironment(gym.Env):
         self.thrust_particles = updated_particles
     
     def render(self):
+        # Import pygame secara lazy, hanya dibutuhkan untuk visualisasi
+        import pygame
+        
         # Pastikan screen ada
         if self.screen is None:
+            pygame.init()
             self.screen = pygame.display.set_mode((self.screen_width, self.screen_height), pygame.HWSURFACE | pygame.DOUBLEBUF)
+            pygame.display.set_caption("Lunar Probe")
         
         # Handle pygame events - penting untuk responsivitas window
         for event in pygame.event.get():
@@ -2,15 +2,17 @@ import tensorflow as tf
 import numpy as np
 
 class LunarLanderAgent:
-    def __init__(self, state_dim, action_dim):
+    def __init__(self, state_dim, action_dim, actor_lr=0.001, critic_lr=0.002):
         self.state_dim = state_dim
         self.action_dim = action_dim
+        self.actor_lr = actor_lr
+        self.critic_lr = critic_lr
         
         self.actor = self._build_actor()
         self.critic = self._build_critic()
         
-        self.actor_optimizer = tf.keras.optimizers.Adam(learning_rate=0.001)
-        self.critic_optimizer = tf.keras.optimizers.Adam(learning_rate=0.002)
+        self.actor_optimizer = tf.keras.optimizers.Adam(learning_rate=actor_lr)
+        self.critic_optimizer = tf.keras.optimizers.Adam(learning_rate=critic_lr)
     
     def _build_actor(self):
         inputs = tf.keras.layers.Input(shape=(self.state_dim,))
@@ -38,6 +40,26 @@ class LunarLanderAgent:
         # Clip ke range [0,1] karena kita menggunakan sigmoid
         return np.clip(action, 0, 1)
     
+    def set_learning_rates(self, actor_lr, critic_lr):
+        self.actor_lr = actor_lr
+        self.critic_lr = critic_lr
+        self.actor_optimizer.learning_rate.assign(actor_lr)
+        self.critic_optimizer.learning_rate.assign(critic_lr)
+    
+    def get_flat_weights(self):
+        # Semua bobot actor lalu critic digabung menjadi satu vektor float32
+        weights = self.actor.get_weights() + self.critic.get_weights()
+        return np.concatenate([w.ravel() for w in weights]).astype(np.float32)
+    
+    def set_flat_weights(self, flat):
+        offset = 0
+        for network in (self.actor, self.critic):
+            weights = []
+            for w in network.get_weights():
+                weights.append(np.reshape(flat[offset:offset + w.size], w.shape))
+                offset += w.size
+            network.set_weights(weights)
+    
     def save(self, path):
         self.actor.save_weights(f"{path}/actor")
         self.critic.save_weights(f"{path}/critic")
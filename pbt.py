@@ -0,0 +1,261 @@
+import os
+import queue
+import random
+import argparse
+import multiprocessing as mp
+from multiprocessing import shared_memory
+from datetime import datetime
+
+import numpy as np
+
+from checkpoint_registry import CHECKPOINT_ROOT, DEFAULT_REGISTRY_PATH
+from train import episode_limit
+
+# Hyperparameter yang dieksplorasi: [actor_lr, critic_lr, noise_scale]
+HYPERPARAMS = ['actor_lr', 'critic_lr', 'noise_scale']
+DEFAULT_HYPERPARAMS = [0.001, 0.002, 0.1]
+PERTURB_FACTORS = [0.8, 1.2]
+
+
+class SharedPopulation:
+    """Bobot, skor dan hyperparameter seluruh populasi di shared memory.
+
+    Bobot tiap member disimpan sebagai satu baris float32 di blok shared
+    memory berukuran [population_size, num_weights]. Setiap baris dijaga oleh
+    lock milik member tersebut sehingga salinan bobot selalu konsisten.
+    """
+    def __init__(self, ctx, population_size):
+        self.population_size = population_size
+        self.shm_name = f"lunar_pbt_{os.getpid()}"
+        self.num_weights = ctx.Value('i', 0)
+        self.scores = ctx.Array('d', [-np.inf] * population_size)
+        self.hyperparams = ctx.Array('d', population_size * len(HYPERPARAMS))
+        self.episodes = ctx.Array('i', population_size)
+        self.locks = [ctx.Lock() for _ in range(population_size)]
+        self.ready = ctx.Event()
+        self._shm = None
+        self._weights = None
+
+    def create(self, num_weights):
+        # Dipanggil proses utama setelah ukuran model diketahui
+        self.num_weights.value = num_weights
+        self._shm = shared_memory.SharedMemory(
+            name=self.shm_name, create=True, size=self.population_size * num_weights * 4
+        )
+        self._attach_view()
+        self.ready.set()
+
+    def attach(self):
+        # Dipanggil tiap worker; menunggu sampai blok shared memory dibuat
+        self.ready.wait()
+        self._shm = shared_memory.SharedMemory(name=self.shm_name)
+        self._attach_view()
+
+    def _attach_view(self):
+        self._weights = np.ndarray(
+            (self.population_size, self.num_weights.value), dtype=np.float32, buffer=self._shm.buf
+        )
+
+    def write(self, rank, flat_weights, score, hyperparams, episode):
+        with self.locks[rank]:
+            self._weights[rank][:] = flat_weights
+            self.scores[rank] = score
+            self.episodes[rank] = episode
+            self.set_hyperparams(rank, hyperparams)
+
+    def read(self, rank):
+        with self.locks[rank]:
+            return self._weights[rank].copy(), self.get_hyperparams(rank)
+
+    def get_hyperparams(self, rank):
+        start = rank * len(HYPERPARAMS)
+        return list(self.hyperparams[start:start + len(HYPERPARAMS)])
+
+    def set_hyperparams(self, rank, hyperparams):
+        start = rank * len(HYPERPARAMS)
+        self.hyperparams[start:start + len(HYPERPARAMS)] = hyperparams
+
+    def ranking(self):
+        # Urutan rank member dari skor tertinggi ke terendah
+        scores = list(self.scores)
+        return sorted(range(self.population_size), key=lambda r: scores[r], reverse=True)
+
+    def close(self, unlink=False):
+        self._weights = None
+        if self._shm is not None:
+            self._shm.close()
+            if unlink:
+                self._shm.unlink()
+            self._shm = None
+
+    def __getstate__(self):
+        # Handle shared memory tidak ikut di-pickle, worker melakukan attach sendiri
+        state = self.__dict__.copy()
+        state['_shm'] = None
+        state['_weights'] = None
+        return state
+
+
+def exploit_and_explore(population, rank, truncation):
+    """Jika member ada di kuantil terbawah, salin bobot member kuantil teratas
+    lalu perturb hyperparameter-nya. Mengembalikan (bobot, hyperparameter, rank
+    sumber) atau None jika member tidak perlu diganti."""
+    ranking = population.ranking()
+    cutoff = max(1, int(len(ranking) * truncation))
+    if rank not in ranking[-cutoff:]:
+        return None
+    # Sumber harus sudah mempublikasikan bobot dan tidak tertinggal episode
+    # dari member ini, supaya skor yang dibandingkan sebanding
+    candidates = [
+        source for source in ranking[:cutoff]
+        if source != rank
+        and population.scores[source] != -np.inf
+        and population.episodes[source] >= population.episodes[rank]
+    ]
+    if not candidates:
+        return None
+    source = random.choice(candidates)
+    weights, hyperparams = population.read(source)
+    hyperparams = [value * random.choice(PERTURB_FACTORS) for value in hyperparams]
+    return weights, hyperparams, source
+
+
+def registry_hyperparams(hyperparams, args):
+    return dict(zip(HYPERPARAMS, hyperparams), max_episode_steps=args.max_episode_steps)
+
+
+def worker(rank, population, size_queue, args, checkpoint_dir):
+    # Satu thread TF per proses agar populasi tidak saling berebut core
+    import tensorflow as tf
+    tf.config.threading.set_intra_op_parallelism_threads(1)
+    tf.config.threading.set_inter_op_parallelism_threads(1)
+
+    from lunar_env import LunarEnvironment
+    from model import LunarLanderAgent
+    from checkpoint_registry import CheckpointRegistry
+    from train import run_episode, save_checkpoint
+
+    random.seed(args.seed + rank)
+    np.random.seed(args.seed + rank)
+    tf.random.set_seed(args.seed + rank)
+
+    # Member pertama memakai hyperparameter default, sisanya diacak di sekitarnya
+    hyperparams = list(DEFAULT_HYPERPARAMS)
+    if rank > 0:
+        hyperparams = [value * random.uniform(0.5, 2.0) for value in hyperparams]
+    actor_lr, critic_lr, noise_scale = hyperparams
+
+    env = LunarEnvironment(max_episode_steps=args.max_episode_steps)
+    agent = LunarLanderAgent(
+        state_dim=env.observation_space.shape[0],
+        action_dim=env.action_space.shape[0],
+        actor_lr=actor_lr,
+        critic_lr=critic_lr
+    )
+
+    if rank == 0:
+        size_queue.put(agent.get_flat_weights().size)
+    population.attach()
+
+    member_dir = f"{checkpoint_dir}/member_{rank}"
+    registry = CheckpointRegistry(args.registry)
+    rewards_history = []
+
+    for episode in range(args.episodes):
+        episode_reward = run_episode(env, agent, noise_scale=noise_scale)
+        rewards_history.append(episode_reward)
+
+        # Publikasikan bobot dan skor, lalu exploit/explore
+        if (episode + 1) % args.ready_interval == 0:
+            score = float(np.mean(rewards_history[-args.ready_interval:]))
+            population.write(rank, agent.get_flat_weights(), score, hyperparams, episode)
+
+            result = exploit_and_explore(population, rank, args.truncation)
+            if result is not None:
+                weights, hyperparams, source = result
+                actor_lr, critic_lr, noise_scale = hyperparams
+                agent.set_flat_weights(weights)
+                agent.set_learning_rates(actor_lr, critic_lr)
+                print(f"[member {rank}] Episode {episode}: copied member {source}, "
+                      f"actor_lr={actor_lr:.2e} critic_lr={critic_lr:.2e} noise={noise_scale:.3f}")
+
+        # Simpan checkpoint
+        if episode % args.save_interval == 0:
+            save_checkpoint(agent, registry, member_dir, episode,
+                            rewards_history[-args.save_interval:], registry_hyperparams(hyperparams, args))
+
+        print(f"[member {rank}] Episode {episode}: Reward = {episode_reward}")
+
+    # Simpan checkpoint episode terakhir
+    save_checkpoint(agent, registry, member_dir, args.episodes-1,
+                    rewards_history[-args.save_interval:], registry_hyperparams(hyperparams, args))
+    registry.close()
+    population.close()
+
+
+def wait_for_weight_count(size_queue, process):
+    while True:
+        try:
+            return size_queue.get(timeout=1.0)
+        except queue.Empty:
+            if not process.is_alive():
+                raise RuntimeError(f"Member 0 exited with code {process.exitcode} before building its model")
+
+
+def train_population(args):
+    if not args.population or args.population < 0:
+        population_size = os.cpu_count() or 1
+    else:
+        population_size = args.population
+    ctx = mp.get_context('spawn')  # TensorFlow tidak aman di-fork
+
+    checkpoint_dir = f"{CHECKPOINT_ROOT}/{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+    os.makedirs(checkpoint_dir, exist_ok=True)
+
+    population = SharedPopulation(ctx, population_size)
+    size_queue = ctx.Queue()
+    processes = [
+        ctx.Process(target=worker, args=(rank, population, size_queue, args, checkpoint_dir))
+        for rank in range(population_size)
+    ]
+    for process in processes:
+        process.start()
+
+    print(f"Training population of {population_size} members")
+    try:
+        population.create(wait_for_weight_count(size_queue, processes[0]))
+        for process in processes:
+            process.join()
+    finally:
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+        population.close(unlink=True)
+
+    failed = [rank for rank, process in enumerate(processes) if process.exitcode != 0]
+    if failed:
+        codes = ', '.join(f"member {rank}: {processes[rank].exitcode}" for rank in failed)
+        raise RuntimeError(f"Population members exited with errors ({codes})")
+
+    for position, rank in enumerate(population.ranking()):
+        hyperparams = dict(zip(HYPERPARAMS, population.get_hyperparams(rank)))
+        print(f"#{position + 1} member {rank}: score = {population.scores[rank]:.2f} {hyperparams}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Population-based training across processes')
+    parser.add_argument('--population', type=int, default=None, help='Population size (default or <= 0: CPU count)')
+    parser.add_argument('--episodes', type=int, default=1000)
+    parser.add_argument('--save-interval', type=int, default=100)
+    parser.add_argument('--max-episode-steps', type=episode_limit, default=1000,
+                        help='Truncate episodes after this many steps (<= 0: no limit)')
+    parser.add_argument('--ready-interval', type=int, default=20,
+                        help='Episodes between exploit/explore steps')
+    parser.add_argument('--truncation', type=float, default=0.2,
+                        help='Fraction of the population replaced / copied from')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--registry', type=str, default=DEFAULT_REGISTRY_PATH,
+                        help='Checkpoint registry database')
+    args = parser.parse_args()
+
+    train_population(args)
@@ -0,0 +1,312 @@
+import os
+import json
+import time
+import stat
+import queue
+import socket
+import ipaddress
+import argparse
+import threading
+import socketserver
+from collections import deque
+
+import numpy as np
+
+from checkpoint_registry import DEFAULT_REGISTRY_PATH, resolve_checkpoint
+
+# Dimensi default sesuai LunarEnvironment (observasi 7, aksi 4 thruster)
+DEFAULT_STATE_DIM = 7
+DEFAULT_ACTION_DIM = 4
+
+
+class _PendingRequest:
+    """Satu request state yang menunggu diproses dalam sebuah batch"""
+    def __init__(self, state):
+        self.state = state
+        self.action = None
+        self.error = None
+        self.enqueued_at = time.perf_counter()
+        self.done = threading.Event()
+
+
+class PolicyStats:
+    """Mencatat latency per request dan throughput server"""
+    def __init__(self, window=10000):
+        self.lock = threading.Lock()
+        self.latencies = deque(maxlen=window)
+        self.batch_sizes = deque(maxlen=window)
+        self.requests = 0
+        self.batches = 0
+        self.started_at = time.perf_counter()
+
+    def record_batch(self, latencies):
+        with self.lock:
+            self.latencies.extend(latencies)
+            self.batch_sizes.append(len(latencies))
+            self.requests += len(latencies)
+            self.batches += 1
+
+    def summary(self):
+        with self.lock:
+            latencies = np.array(self.latencies) * 1000.0
+            batch_sizes = list(self.batch_sizes)
+            requests, batches = self.requests, self.batches
+        elapsed = time.perf_counter() - self.started_at
+        summary = {
+            'requests': requests,
+            'batches': batches,
+            'uptime_s': elapsed,
+            'throughput_rps': requests / elapsed if elapsed > 0 else 0.0,
+            'mean_batch_size': float(np.mean(batch_sizes)) if batch_sizes else 0.0,
+        }
+        for p in (50, 95, 99):
+            summary[f'latency_p{p}_ms'] = float(np.percentile(latencies, p)) if len(latencies) else 0.0
+        return summary
+
+
+class PolicyServer:
+    """Memuat checkpoint LunarLanderAgent sekali dan melayani aksi secara batch.
+
+    Request dikumpulkan hingga max_batch_size terpenuhi atau max_latency_ms
+    sejak request pertama di batch terlewati, mana yang lebih dulu.
+    """
+    def __init__(self, checkpoint_path, state_dim=DEFAULT_STATE_DIM, action_dim=DEFAULT_ACTION_DIM,
+                 max_batch_size=32, max_latency_ms=2.0):
+        self.state_dim = state_dim
+        self.action_dim = action_dim
+        self.max_batch_size = max_batch_size
+        self.max_latency = max_latency_ms / 1000.0
+
+        self.requests = queue.Queue()
+        self.stats = PolicyStats()
+        self.checkpoint_path = None
+        self.agent = None
+        self.reload(checkpoint_path)
+
+        self._running = True
+        self._worker = threading.Thread(target=self._batch_loop, daemon=True)
+        self._worker.start()
+
+    def _load_agent(self, checkpoint_path):
+        # TensorFlow hanya dimuat di proses server, bukan di client
+        from model import LunarLanderAgent
+
+        agent = LunarLanderAgent(state_dim=self.state_dim, action_dim=self.action_dim)
+        agent.load(checkpoint_path)
+        # Warm-up supaya request pertama tidak menanggung biaya tracing
+        agent.actor(np.zeros((1, self.state_dim), dtype=np.float32))
+        return agent
+
+    def reload(self, checkpoint_path):
+        """Hot-reload checkpoint baru; request yang sedang berjalan tetap memakai model lama"""
+        agent = self._load_agent(checkpoint_path)
+        self.agent = agent
+        self.checkpoint_path = checkpoint_path
+        print(f"Loaded checkpoint from {checkpoint_path}")
+
+    def submit(self, state):
+        """Kirim satu state ke batcher dan tunggu aksinya"""
+        pending = _PendingRequest(np.asarray(state, dtype=np.float32))
+        if pending.state.shape != (self.state_dim,):
+            raise ValueError(f"Expected state of shape ({self.state_dim},), got {pending.state.shape}")
+        self.requests.put(pending)
+        pending.done.wait()
+        if pending.error is not None:
+            raise pending.error
+        return pending.action
+
+    def _collect_batch(self):
+        try:
+            first = self.requests.get(timeout=0.1)
+        except queue.Empty:
+            return []
+        batch = [first]
+        deadline = first.enqueued_at + self.max_latency
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self.requests.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _batch_loop(self):
+        while self._running:
+            batch = self._collect_batch()
+            if not batch:
+                continue
+            agent = self.agent
+            try:
+                states = np.stack([pending.state for pending in batch])
+                actions = np.clip(agent.actor(states).numpy(), 0, 1)
+                for pending, action in zip(batch, actions):
+                    pending.action = action.tolist()
+            except Exception as e:
+                for pending in batch:
+                    pending.error = e
+            finished_at = time.perf_counter()
+            self.stats.record_batch([finished_at - pending.enqueued_at for pending in batch])
+            for pending in batch:
+                pending.done.set()
+
+    def handle(self, message):
+        """Proses satu pesan JSON dari client dan kembalikan responsnya"""
+        cmd = message.get('cmd', 'act')
+        if cmd == 'act':
+            return {'action': self.submit(message['state'])}
+        if cmd == 'stats':
+            return {'stats': self.stats.summary(), 'checkpoint': self.checkpoint_path}
+        if cmd == 'reload':
+            self.reload(message['path'])
+            return {'checkpoint': self.checkpoint_path}
+        raise ValueError(f"Unknown command: {cmd}")
+
+    def stop(self):
+        self._running = False
+        self._worker.join()
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """Protokol sederhana: satu objek JSON per baris, satu respons per baris"""
+    def handle(self):
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            try:
+                response = self.server.policy.handle(json.loads(line))
+            except Exception as e:
+                response = {'error': f"{type(e).__name__}: {e}"}
+            self.wfile.write((json.dumps(response) + '\n').encode())
+            self.wfile.flush()
+
+
+class _TCPServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+if hasattr(socketserver, 'UnixStreamServer'):
+    class _UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+        daemon_threads = True
+
+
+class PolicyClient:
+    """Client ringan untuk PolicyServer, tidak membutuhkan TensorFlow"""
+    def __init__(self, address):
+        if isinstance(address, str):
+            self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        else:
+            self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.sock.connect(address)
+        self.file = self.sock.makefile('rwb')
+
+    def _request(self, message):
+        self.file.write((json.dumps(message) + '\n').encode())
+        self.file.flush()
+        response = json.loads(self.file.readline())
+        if 'error' in response:
+            raise RuntimeError(response['error'])
+        return response
+
+    def get_action(self, state):
+        return np.array(self._request({'cmd': 'act', 'state': [float(x) for x in state]})['action'])
+
+    def stats(self):
+        return self._request({'cmd': 'stats'})['stats']
+
+    def reload(self, checkpoint_path):
+        return self._request({'cmd': 'reload', 'path': checkpoint_path})['checkpoint']
+
+    def close(self):
+        self.file.close()
+        self.sock.close()
+
+
+def parse_address(value):
+    """'host:port' menjadi alamat TCP, selain itu dianggap path Unix socket.
+
+    Hanya host loopback yang diterima: perintah `reload` memuat path apa pun
+    dari client sehingga server tidak boleh terbuka ke jaringan.
+    """
+    host, sep, port = value.rpartition(':')
+    if sep and port.isdigit():
+        host = host or '127.0.0.1'
+        if host != 'localhost':
+            try:
+                loopback = ipaddress.ip_address(host).is_loopback
+            except ValueError:
+                loopback = False
+            if not loopback:
+                raise ValueError(f"Refusing non-loopback address {value}, the policy server is local only")
+        return (host, int(port))
+    return value
+
+
+def _is_socket(path):
+    return stat.S_ISSOCK(os.stat(path).st_mode)
+
+
+def serve(args):
+    address = parse_address(args.address)
+    # Hanya hapus sisa socket lama; file biasa di path yang sama tidak disentuh
+    if isinstance(address, str) and os.path.exists(address):
+        if not _is_socket(address):
+            raise FileExistsError(f"{address} exists and is not a Unix socket")
+        os.remove(address)
+
+    policy = PolicyServer(
+        args.checkpoint_path,
+        state_dim=args.state_dim,
+        action_dim=args.action_dim,
+        max_batch_size=args.max_batch_size,
+        max_latency_ms=args.max_latency_ms
+    )
+
+    if isinstance(address, str):
+        server = _UnixServer(address, _RequestHandler)
+    else:
+        server = _TCPServer(address, _RequestHandler)
+    server.policy = policy
+
+    print(f"Serving policy on {args.address}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        policy.stop()
+        if isinstance(address, str) and os.path.exists(address) and _is_socket(address):
+            os.remove(address)
+        print(json.dumps(policy.stats.summary(), indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Local policy inference server with dynamic batching')
+    parser.add_argument('--checkpoint-path', type=str, default=None,
+                        help='Path to checkpoint directory (default: best checkpoint in the registry)')
+    parser.add_argument('--registry', type=str, default=DEFAULT_REGISTRY_PATH,
+                        help='Checkpoint registry database')
+    parser.add_argument('--run-id', type=str, default=None,
+                        help='Serve the best checkpoint of this run')
+    parser.add_argument('--address', type=str, default='/tmp/lunar_policy.sock',
+                        help='Unix socket path or loopback host:port for local TCP')
+    parser.add_argument('--max-batch-size', type=int, default=32)
+    parser.add_argument('--max-latency-ms', type=float, default=2.0)
+    parser.add_argument('--state-dim', type=int, default=DEFAULT_STATE_DIM)
+    parser.add_argument('--action-dim', type=int, default=DEFAULT_ACTION_DIM)
+    args = parser.parse_args()
+
+    if args.checkpoint_path is None:
+        args.checkpoint_path = resolve_checkpoint(args.registry, args.run_id, which='best')
+        if args.checkpoint_path is None:
+            parser.error('no scored checkpoint in registry, please specify --checkpoint-path')
+
+    try:
+        parse_address(args.address)
+    except ValueError as e:
+        parser.error(str(e))
+
+    serve(args)
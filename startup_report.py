@@ -0,0 +1,63 @@
+import os
+import sys
+import time
+import argparse
+import subprocess
+
+# Modul berat yang ingin kita pantau saat startup
+HEAVY_MODULES = ['tensorflow', 'pygame', 'matplotlib', 'gymnasium']
+
+# Skenario startup yang diukur: (nama, kode python yang dijalankan)
+SCENARIOS = [
+    ('python (baseline)', 'pass'),
+    ('train.py --help', "import sys, runpy; sys.argv = ['train.py', '--help']\n"
+                        "try:\n    runpy.run_path('train.py', run_name='__main__')\n"
+                        "except SystemExit:\n    pass"),
+    ('import train', 'import train'),
+    ('import lunar_env', 'import lunar_env'),
+    ('LunarEnvironment() headless', 'from lunar_env import LunarEnvironment; LunarEnvironment().reset()'),
+    ('import model', 'import model'),
+]
+
+REPORT_MODULES = (
+    "\nimport sys\n"
+    "print('LOADED=' + ','.join(m for m in {modules!r} if m in sys.modules))"
+)
+
+def measure(code, repeat):
+    """Run code in a fresh interpreter and return (best wall time, loaded heavy modules)"""
+    script = code + REPORT_MODULES.format(modules=HEAVY_MODULES)
+    cwd = os.path.dirname(os.path.abspath(__file__))
+    best = None
+    loaded = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = subprocess.run(
+            [sys.executable, '-c', script],
+            cwd=cwd, capture_output=True, text=True
+        )
+        elapsed = time.perf_counter() - start
+        if result.returncode != 0:
+            return None, result.stderr.strip().splitlines()[-1:]
+        best = elapsed if best is None else min(best, elapsed)
+        for line in result.stdout.splitlines():
+            if line.startswith('LOADED='):
+                loaded = [m for m in line[len('LOADED='):].split(',') if m]
+    return best, loaded
+
+def main(args):
+    print(f"{'Scenario':<32}{'Time (s)':>10}  Heavy modules loaded")
+    print('-' * 72)
+    for name, code in SCENARIOS:
+        elapsed, loaded = measure(code, args.repeat)
+        if elapsed is None:
+            print(f"{name:<32}{'error':>10}  {' '.join(loaded)}")
+        else:
+            print(f"{name:<32}{elapsed:>10.3f}  {', '.join(loaded) or '-'}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Report startup time of the entry points')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per scenario, best time is reported')
+    args = parser.parse_args()
+
+    main(args)
@@ -1,10 +1,12 @@
 import pygame
 import sys
+import argparse
 from lunar_env import LunarEnvironment
 
-def manual_control():
+def manual_control(policy_client=None):
     pygame.init()
-    env = LunarEnvironment()
+    # Kontrol manual tidak dibatasi waktu
+    env = LunarEnvironment(max_episode_steps=None)
     state = env.reset()
     
     # Render initial state
@@ -41,30 +43,34 @@ def manual_control():
                     env.render()  # Add render after reset
                     pygame.display.flip()
         
-        # Get continuous key states
-        keys = pygame.key.get_pressed()
-        
-        # Mapping keyboard ke actions:
-        # actions[0] = left thruster (bergerak ke kanan)
-        # actions[1] = right thruster (bergerak ke kiri)
-        # actions[2] = top thruster (bergerak ke bawah)
-        # actions[3] = bottom thruster (bergerak ke atas)
-        
-        if keys[pygame.K_LEFT]:
-            actions[1] = thrust_power  # Aktifkan right thruster
-        if keys[pygame.K_RIGHT]:
-            actions[0] = thrust_power  # Aktifkan left thruster
-        if keys[pygame.K_UP]:
-            actions[3] = thrust_power  # Aktifkan bottom thruster
-        if keys[pygame.K_DOWN]:
-            actions[2] = thrust_power  # Aktifkan top thruster
+        # Mode autopilot: aksi diambil dari policy server
+        if policy_client is not None:
+            actions = policy_client.get_action(state)
+        else:
+            # Get continuous key states
+            keys = pygame.key.get_pressed()
+            
+            # Mapping keyboard ke actions:
+            # actions[0] = left thruster (bergerak ke kanan)
+            # actions[1] = right thruster (bergerak ke kiri)
+            # actions[2] = top thruster (bergerak ke bawah)
+            # actions[3] = bottom thruster (bergerak ke atas)
+            
+            if keys[pygame.K_LEFT]:
+                actions[1] = thrust_power  # Aktifkan right thruster
+            if keys[pygame.K_RIGHT]:
+                actions[0] = thrust_power  # Aktifkan left thruster
+            if keys[pygame.K_UP]:
+                actions[3] = thrust_power  # Aktifkan bottom thruster
+            if keys[pygame.K_DOWN]:
+                actions[2] = thrust_power  # Aktifkan top thruster
             
         # Apply actions and update environment
-        state, reward, done, _ = env.step(actions)
+        state, reward, terminated, truncated, _ = env.step(actions)
         env.render()  # Make sure to render after each step
         pygame.display.flip()
         
-        if done:
+        if terminated or truncated:
             state = env.reset()
             env.render()  # Add render after reset on done
             pygame.display.flip()
@@ -75,4 +81,14 @@ def manual_control():
     sys.exit()
 
 if __name__ == "__main__":
-    manual_control()
\ No newline at end of file
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--autopilot', type=str, metavar='ADDRESS',
+                        help='Ambil aksi dari policy_server.py (Unix socket path atau host:port)')
+    args = parser.parse_args()
+    
+    policy_client = None
+    if args.autopilot:
+        from policy_server import PolicyClient, parse_address
+        policy_client = PolicyClient(parse_address(args.autopilot))
+    
+    manual_control(policy_client)
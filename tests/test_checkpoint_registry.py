@@ -0,0 +1,126 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from checkpoint_registry import CheckpointRegistry
+from train import save_checkpoint
+
+
+def make_checkpoint(path):
+    os.makedirs(path, exist_ok=True)
+    for name in ('actor.index', 'critic.index'):
+        with open(os.path.join(path, name), 'w') as f:
+            f.write(path)
+    return path
+
+
+class FakeAgent:
+    actor_lr = 0.001
+    critic_lr = 0.002
+
+    def save(self, path):
+        make_checkpoint(path)
+
+
+@pytest.fixture
+def registry(tmp_path):
+    registry = CheckpointRegistry(str(tmp_path / 'checkpoints' / 'registry.db'),
+                                  checkpoint_root=str(tmp_path / 'checkpoints'))
+    yield registry
+    registry.close()
+
+
+def test_best_and_latest_per_run(registry, tmp_path):
+    ep_1 = make_checkpoint(str(tmp_path / 'checkpoints' / 'run' / 'ep_1'))
+    ep_2 = make_checkpoint(str(tmp_path / 'checkpoints' / 'run' / 'ep_2'))
+    registry.register(ep_1, 'run', 1, score=10.0)
+    registry.register(ep_2, 'run', 2, score=5.0)
+
+    assert registry.best('run')['path'] == ep_1
+    assert registry.latest('run')['path'] == ep_2
+
+
+def test_lowering_best_score_moves_best_pointer(registry, tmp_path):
+    ep_1 = make_checkpoint(str(tmp_path / 'checkpoints' / 'run' / 'ep_1'))
+    ep_2 = make_checkpoint(str(tmp_path / 'checkpoints' / 'run' / 'ep_2'))
+    registry.register(ep_1, 'run', 1, score=10.0)
+    registry.register(ep_2, 'run', 2, score=5.0)
+
+    registry.update_score(ep_1, 0.0)
+
+    assert registry.best('run')['path'] == ep_2
+    assert registry.best()['path'] == ep_2
+
+
+def test_reregistering_best_with_lower_score_moves_best_pointer(registry, tmp_path):
+    ep_1 = make_checkpoint(str(tmp_path / 'checkpoints' / 'run' / 'ep_1'))
+    ep_2 = make_checkpoint(str(tmp_path / 'checkpoints' / 'run' / 'ep_2'))
+    registry.register(ep_1, 'run', 1, score=10.0)
+    registry.register(ep_2, 'run', 2, score=5.0)
+
+    registry.register(ep_1, 'run', 1, score=0.0)
+
+    assert registry.best('run')['path'] == ep_2
+    assert registry.latest('run')['path'] == ep_2
+
+
+def test_save_checkpoint_run_id_independent_of_registry_location(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    registry = CheckpointRegistry(str(tmp_path / 'elsewhere' / 'registry.db'))
+    try:
+        save_checkpoint(FakeAgent(), registry, 'checkpoints/20250101_000000/member_0', 0, [1.0], {})
+
+        record = registry.latest('20250101_000000/member_0')
+        assert record is not None
+        assert record['path'] == str(tmp_path / 'checkpoints' / '20250101_000000' / 'member_0' / 'ep_0')
+    finally:
+        registry.close()
+
+
+def test_gc_delete_refused_before_import(registry, tmp_path):
+    make_checkpoint(str(tmp_path / 'checkpoints' / 'old_run' / 'ep_0'))
+
+    with pytest.raises(RuntimeError):
+        registry.gc(dry_run=False, min_age=0)
+    assert os.path.isdir(tmp_path / 'checkpoints' / 'old_run' / 'ep_0')
+
+
+def test_gc_skips_recent_unregistered_checkpoints(registry, tmp_path):
+    old = make_checkpoint(str(tmp_path / 'checkpoints' / 'run' / 'ep_0'))
+    registry.import_existing()
+    registry.unregister(old)
+    fresh = make_checkpoint(str(tmp_path / 'checkpoints' / 'run' / 'ep_1'))
+    past = os.path.getmtime(old) - 2 * 3600
+    for path in (old, os.path.join(old, 'actor.index'), os.path.join(old, 'critic.index')):
+        os.utime(path, (past, past))
+
+    removed = registry.gc(dry_run=False)
+
+    assert removed == [old]
+    assert not os.path.exists(old)
+    assert os.path.isdir(fresh)
+
+
+def test_import_and_gc_use_checkpoint_root_not_registry_location(tmp_path):
+    checkpoint = make_checkpoint(str(tmp_path / 'checkpoints' / 'run' / 'ep_3'))
+    stray = make_checkpoint(str(tmp_path / 'elsewhere' / 'stray'))
+    registry = CheckpointRegistry(str(tmp_path / 'elsewhere' / 'registry.db'),
+                                  checkpoint_root=str(tmp_path / 'checkpoints'))
+    try:
+        assert registry.import_existing() == 1
+        assert registry.latest('run')['path'] == checkpoint
+        assert registry.gc(dry_run=False, min_age=0) == []
+        assert os.path.isdir(stray)
+    finally:
+        registry.close()
+
+
+def test_global_latest_uses_index(registry):
+    plan = registry.conn.execute(
+        'EXPLAIN QUERY PLAN SELECT * FROM checkpoints ORDER BY created_at DESC, id DESC LIMIT 1'
+    ).fetchall()
+
+    assert not any('TEMP B-TREE' in row['detail'] for row in plan)
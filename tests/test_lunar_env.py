@@ -0,0 +1,69 @@
+import os
+import sys
+
+import pytest
+
+np = pytest.importorskip('numpy')
+pytest.importorskip('gymnasium')
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lunar_env import LunarEnvironment
+
+NO_THRUST = np.zeros(4)
+
+
+def hover_action(env):
+    # Thruster bawah tepat melawan gravitasi sehingga probe diam di tempat
+    return np.array([0, 0, 0, env.gravity / env.thrust_force])
+
+
+def place_at_target(env, y):
+    env.state['x'] = env.state['target_x']
+    env.state['y'] = y
+    env.state['vel_x'] = 0.0
+    env.state['vel_y'] = 0.0
+
+
+def test_truncates_at_max_episode_steps():
+    env = LunarEnvironment(max_episode_steps=3)
+    env.reset()
+
+    for _ in range(2):
+        _, _, terminated, truncated, _ = env.step(hover_action(env))
+        assert not terminated and not truncated
+
+    _, _, terminated, truncated, _ = env.step(hover_action(env))
+    assert not terminated
+    assert truncated
+
+
+def test_no_time_limit_when_max_episode_steps_is_none():
+    env = LunarEnvironment(max_episode_steps=None)
+    env.reset()
+
+    for _ in range(1500):
+        _, _, terminated, truncated, _ = env.step(hover_action(env))
+        assert not terminated and not truncated
+
+
+def test_not_truncated_when_episode_also_terminates():
+    env = LunarEnvironment(max_episode_steps=1)
+    env.reset()
+    place_at_target(env, env.state['target_y'])
+
+    _, _, terminated, truncated, _ = env.step(NO_THRUST)
+
+    assert terminated
+    assert not truncated
+
+
+def test_landing_in_lower_half_of_target_zone_is_rewarded():
+    env = LunarEnvironment()
+    env.reset()
+    place_at_target(env, 487)
+
+    _, reward, terminated, _, _ = env.step(NO_THRUST)
+
+    assert reward > 0
+    assert terminated
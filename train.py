@@ -1,10 +1,11 @@
 import os
 import argparse
-import numpy as np
 from datetime import datetime
-from lunar_env import LunarEnvironment
-from model import LunarLanderAgent
-import matplotlib.pyplot as plt
+
+from checkpoint_registry import CHECKPOINT_ROOT, DEFAULT_REGISTRY_PATH
+
+# lunar_env (gymnasium), model (TensorFlow) dan matplotlib sengaja di-import
+# di dalam fungsi agar `train.py --help` dan proses singkat lain tetap cepat.
 
 def get_episode_from_checkpoint(checkpoint_path):
     """Extract episode number from checkpoint path"""
@@ -14,80 +15,159 @@ def get_episode_from_checkpoint(checkpoint_path):
     except:
         return 0
 
+def plot_rewards(rewards_history, path='metrics/training_progress.png'):
+    """Plot reward per episode and save it to path"""
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    plt.plot(rewards_history)
+    plt.title('Training Progress')
+    plt.xlabel('Episode')
+    plt.ylabel('Reward')
+    plt.savefig(path)
+
+def save_checkpoint(agent, registry, checkpoint_dir, episode, recent_rewards, hyperparams):
+    """Save agent weights and record them in the checkpoint registry"""
+    checkpoint_path = f"{checkpoint_dir}/ep_{episode}"
+    agent.save(checkpoint_path)
+    # Skor = rata-rata reward episode sejak checkpoint sebelumnya
+    score = sum(recent_rewards) / len(recent_rewards) if recent_rewards else None
+    registry.register(
+        checkpoint_path,
+        # Run ID = direktori run di bawah checkpoints/ (<ts> atau <ts>/member_<n>),
+        # tidak bergantung pada lokasi database registry
+        run_id=os.path.relpath(checkpoint_dir, CHECKPOINT_ROOT),
+        episode=episode,
+        score=score,
+        hyperparams=hyperparams
+    )
+
+def episode_limit(value):
+    """Argparse type for --max-episode-steps: <= 0 means no limit"""
+    steps = int(value)
+    return steps if steps > 0 else None
+
+def run_episode(env, agent, noise_scale=0.1, render=False):
+    """Run one episode and return its total reward"""
+    state = env.reset()
+    episode_reward = 0
+    
+    while True:
+        action = agent.get_action(state, noise_scale=noise_scale)
+        next_state, reward, terminated, truncated, _ = env.step(action)
+        episode_reward += reward
+        
+        # Training step
+        # Target critic: reward + gamma * (1 - terminated) * Q(next_state, actor(next_state)).
+        # Hanya `terminated` yang memutus bootstrap; episode yang dipotong
+        # time limit (`truncated`) tetap di-bootstrap dari next_state.
+        # ... implementasi algoritma training ...
+        
+        if terminated or truncated:
+            break
+        
+        state = next_state
+        
+        if render:
+            env.render()
+    
+    return episode_reward
+
 def train(args):
-    env = LunarEnvironment()
+    from checkpoint_registry import CheckpointRegistry
+    from lunar_env import LunarEnvironment
+    from model import LunarLanderAgent
+    
+    env = LunarEnvironment(max_episode_steps=args.max_episode_steps)
     agent = LunarLanderAgent(
         state_dim=env.observation_space.shape[0],
         action_dim=env.action_space.shape[0]
     )
     
+    registry = CheckpointRegistry(args.registry)
+    
     # Initialize start_episode
     start_episode = 0
     
     if args.resume:
         if args.checkpoint_path:
             checkpoint_path = args.checkpoint_path
-            agent.load(checkpoint_path)
             start_episode = get_episode_from_checkpoint(checkpoint_path)
-            print(f"Loaded checkpoint from {checkpoint_path}")
-            print(f"Continuing training from episode {start_episode}")
         else:
-            print("Please specify checkpoint path using --checkpoint-path")
-            return
+            # Ambil checkpoint terakhir dari registry tanpa scan direktori
+            record = registry.latest(args.run_id)
+            if record is None:
+                print("No checkpoint in registry, please specify --checkpoint-path")
+                registry.close()
+                return
+            checkpoint_path = record['path']
+            start_episode = record['episode'] + 1
+        agent.load(checkpoint_path)
+        print(f"Loaded checkpoint from {checkpoint_path}")
+        print(f"Continuing training from episode {start_episode}")
     
     # Setup direktori untuk checkpoint
-    checkpoint_dir = f"checkpoints/{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+    checkpoint_dir = f"{CHECKPOINT_ROOT}/{datetime.now().strftime('%Y%m%d_%H%M%S')}"
     os.makedirs(checkpoint_dir, exist_ok=True)
     
     rewards_history = []
+    hyperparams = {
+        'actor_lr': agent.actor_lr,
+        'critic_lr': agent.critic_lr,
+        'noise_scale': 0.1,
+        'max_episode_steps': args.max_episode_steps
+    }
     
     total_episodes = start_episode + args.episodes
     
     for episode in range(start_episode, total_episodes):
-        state = env.reset()
-        episode_reward = 0
-        
-        while True:
-            action = agent.get_action(state, noise_scale=0.1)
-            next_state, reward, done, _ = env.step(action)
-            episode_reward += reward
-            
-            # Training step
-            # ... implementasi algoritma training ...
-            
-            if done:
-                break
-            
-            state = next_state
-            
-            if args.render:
-                env.render()
-        
+        episode_reward = run_episode(env, agent, noise_scale=0.1, render=args.render)
         rewards_history.append(episode_reward)
         
         # Simpan checkpoint
         if episode % args.save_interval == 0:
-            agent.save(f"{checkpoint_dir}/ep_{episode}")
+            save_checkpoint(agent, registry, checkpoint_dir, episode,
+                            rewards_history[-args.save_interval:], hyperparams)
         
         print(f"Episode {episode}: Reward = {episode_reward}")
     
     # Simpan checkpoint episode terakhir
-    agent.save(f"{checkpoint_dir}/ep_{total_episodes-1}")
+    save_checkpoint(agent, registry, checkpoint_dir, total_episodes-1,
+                    rewards_history[-args.save_interval:], hyperparams)
+    registry.close()
     
     # Plot hasil training
-    plt.plot(rewards_history)
-    plt.title('Training Progress')
-    plt.xlabel('Episode')
-    plt.ylabel('Reward')
-    plt.savefig('metrics/training_progress.png')
+    plot_rewards(rewards_history)
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument('--episodes', type=int, default=1000)
     parser.add_argument('--save-interval', type=int, default=100)
     parser.add_argument('--render', action='store_true')
+    parser.add_argument('--max-episode-steps', type=episode_limit, default=1000,
+                        help='Truncate episodes after this many steps (<= 0: no limit)')
     parser.add_argument('--resume', action='store_true')
     parser.add_argument('--checkpoint-path', type=str, help='Path to checkpoint directory')
+    parser.add_argument('--registry', type=str, default=DEFAULT_REGISTRY_PATH,
+                        help='Checkpoint registry database')
+    parser.add_argument('--run-id', type=str, default=None,
+                        help='Resume the latest checkpoint of this run (default: latest overall)')
+    parser.add_argument('--population', type=int, default=0,
+                        help='Population-based training with N members in parallel processes (-1: CPU count)')
+    parser.add_argument('--ready-interval', type=int, default=20,
+                        help='Episodes between exploit/explore steps in population mode')
+    parser.add_argument('--truncation', type=float, default=0.2,
+                        help='Fraction of the population replaced / copied from in population mode')
+    parser.add_argument('--seed', type=int, default=0)
     args = parser.parse_args()
     
-    train(args)
\ No newline at end of file
+    if args.population:
+        # Mode populasi selalu mulai dari awal dan berjalan headless
+        if args.resume or args.checkpoint_path or args.run_id or args.render:
+            parser.error('--population cannot be combined with --resume, --checkpoint-path, --run-id or --render')
+        from pbt import train_population
+        train_population(args)
+    else:
+        train(args)
\ No newline at end of file